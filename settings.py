@@ -1,20 +1,140 @@
+import os
+import re
+import sys
+import tempfile
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 from pydantic import BaseModel, FilePath, ValidationError, DirectoryPath
-from rich.console import Console
 
-console = Console()
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+    _json_loads = json.loads
+
+_MARKUP = re.compile(r"\[/?[a-z ]+\]|:[a-z_]+: ?")
+
+class _PlainConsole:
+    """
+    Substituto do rich Console para execuções sem terminal.
+    As marcações são removidas só do template; os valores interpolados saem literais.
+    """
+    def print(self, template="", *values):
+        print(_MARKUP.sub("", template).format(*values))
+
+class _RichConsole:
+    """Console rich em que os valores interpolados são escapados antes de entrar no template."""
+    def __init__(self):
+        from rich.console import Console
+        from rich.markup import escape
+        self._console = Console()
+        self._escape = escape
+
+    def print(self, template="", *values):
+        self._console.print(template.format(*(self._escape(str(v)) for v in values)))
+
+@lru_cache(maxsize=1)
+def _console():
+    """
+    Retorna o console de diagnóstico, importando o rich apenas quando necessário.
+    Em terminais e notebooks usa o rich; com GKA_QUIET ou saída redirecionada, print simples.
+    Uso: _console().print("[cyan]{}[/cyan]", valor), com os valores fora do template.
+    """
+    interactive = 'ipykernel' in sys.modules or (sys.stdout is not None and sys.stdout.isatty())
+    if os.environ.get('GKA_QUIET') or not interactive:
+        return _PlainConsole()
+    return _RichConsole()
 
 def join_constructor(loader, node):
     """
     Construtor YAML para concatenar strings (usado para montar caminhos).
     """
-    seq = loader.construct_sequence(node)
-    return "".join([str(i) for i in seq])
+    seq = loader.construct_sequence(node, deep=True)
+    if all(type(i) is str for i in seq):
+        return "".join(seq)
+    return "".join(map(str, seq))
+
+_Loader.add_constructor('!join', join_constructor)
+
+def read_config_cache(cache_path, stat):
+    """
+    Lê o cache JSON do config.yaml, se ele ainda corresponder ao arquivo original.
+    Retorna None quando o cache não existe, está corrompido ou desatualizado.
+    """
+    try:
+        cache = _json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
 
-yaml.add_constructor('!join', join_constructor)
+    if not isinstance(cache, dict):
+        return None
+    if cache.get('mtime_ns') != stat.st_mtime_ns or cache.get('size') != stat.st_size:
+        return None
+    return cache.get('data')
+
+def write_config_cache(cache_path, stat, raw_data):
+    """
+    Grava o conteúdo já interpretado do config.yaml em um cache JSON.
+    Só grava quando o JSON devolve exatamente os mesmos dados (datas ou chaves não
+    textuais do YAML mudariam de tipo). A escrita passa por um arquivo temporário +
+    os.replace, para que processos concorrentes nunca leiam um cache pela metade.
+    Falhas de serialização ou de escrita (ex: diretório somente leitura) são ignoradas.
+    """
+    try:
+        payload = _json_dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'data': raw_data})
+        if _json_loads(payload)['data'] != raw_data:
+            return
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    except (OSError, TypeError, ValueError):
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(payload)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+
+def load_config(config_path):
+    """
+    Retorna o conteúdo interpretado do config.yaml, usando o cache JSON quando válido.
+    """
+    cache_path = config_path.with_suffix('.yaml.cache.json')
+    stat = config_path.stat()
+    raw_data = read_config_cache(cache_path, stat)
+
+    if raw_data is None:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            raw_data = yaml.load(file, Loader=_Loader)
+        write_config_cache(cache_path, stat, raw_data)
+    return raw_data
 
 class PathConfig(BaseModel):
+    """
+    Schema de caminhos sem verificação em disco.
+    A existência de cada arquivo é conferida apenas no primeiro acesso à property.
+    """
+    base: Path
+    cadastro: Path
+    gka_por_segmento: Path
+    lista_gka: Path
+    portfolio: Path
+    oem: Path
+    sellin: Path
+    output_path: Path
+
+class ValidatedPathConfig(PathConfig):
     """
     Schema de validação de caminhos. 
     O tipo FilePath garante que o arquivo EXISTA no disco.
@@ -29,70 +149,175 @@ class PathConfig(BaseModel):
     output_path: DirectoryPath
 
 class Settings:
-    def __init__(self, config_file='config.yaml'):
+    """
+    Configurações do projeto carregadas a partir do config.yaml.
+    Cada arquivo de configuração é carregado uma única vez por processo;
+    novas instâncias com o mesmo config_file reaproveitam a já carregada
+    (e são validadas nesse momento se validate=True e ainda não tiverem sido).
+    Com validate=True todos os caminhos são verificados (em paralelo) na carga;
+    caso contrário, cada arquivo é conferido no primeiro acesso à sua property.
+    """
+    _instances: dict[str, 'Settings'] = {}
+
+    def __new__(cls, config_file='config.yaml', validate=False):
+        if config_file in cls._instances:
+            return cls._instances[config_file]
+        instance = super().__new__(cls)
+        instance._initialized = False
+        return instance
+
+    def __init__(self, config_file='config.yaml', validate=False):
+        if self._initialized:
+            # Instância reaproveitada: validate=True ainda confere os caminhos se ela não foi validada.
+            if validate and not self._validated:
+                self._validate_paths()
+            return
+
+        self._initialize(config_file, validate)
+        self._initialized = True
+        type(self)._instances[config_file] = self
+
+    @classmethod
+    def reset_cache(cls):
+        """Descarta as instâncias em cache, forçando uma nova leitura do YAML."""
+        cls._instances.clear()
+
+    @classmethod
+    def from_dict(cls, raw_data, validate=False):
+        """
+        Cria uma instância a partir de um config já interpretado, sem ler o YAML.
+        Permite compartilhar o mesmo conteúdo entre várias instâncias (ex: testes).
+        A instância criada não é guardada no cache de instâncias por config_file.
+        """
+        instance = object.__new__(cls)
+        instance._apply(raw_data, validate)
+        instance._initialized = True
+        return instance
+
+    def _initialize(self, config_file, validate):
         config_path = Path(__file__).parent / config_file
 
         if not config_path.exists():
-            console.print(f"[bold red]ERRO:[/bold red] Configuração não encontrada em {config_path}")
+            _console().print("[bold red]ERRO:[/bold red] Configuração não encontrada em {}", config_path)
             raise RuntimeError("Configuração inválida")
-        
+
         try:
-            with open(config_path, 'r', encoding='utf-8') as file:
-                raw_data = yaml.load(file, Loader=yaml.FullLoader)
-            
-            self._paths = PathConfig(**raw_data.get('paths', {}))
+            raw_data = load_config(config_path)
+        except Exception as e:
+            _console().print("[bold red]ERRO INESPERADO AO LER YAML:[/bold red] {}", e)
+            raise RuntimeError("Erro Inesperado")
+
+        self._apply(raw_data, validate)
+
+    def _apply(self, raw_data, validate=False):
+        try:
+            paths = raw_data.get('paths', {})
+            missing = PathConfig.model_fields.keys() - paths.keys()
+
+            # Campos ausentes ou valores que não são caminhos (ex: `base:` vazio) passam
+            # pela validação do Pydantic para reportar todos os erros.
+            if missing or any(not isinstance(v, (str, os.PathLike)) for v in paths.values()):
+                self._paths = ValidatedPathConfig(**paths)
+            else:
+                self._paths = PathConfig.model_construct(**{k: Path(v) for k, v in paths.items()})
             self._colors = raw_data.get('ui', {}).get('colors', [])
             self._outputs = raw_data.get('outputs', {}).get('file_name', [])
-            
-            console.print("[bold green]:white_check_mark: Configurações e arquivos validados com sucesso![/bold green]")
+            self._validated = False
 
         except ValidationError as e:
-            console.print("\n[bold yellow]:warning: Falha na integridade dos dados/caminhos:[/bold yellow]")
+            failures = []
             for error in e.errors():
-                campo = error['loc'][0]
                 msg = "Arquivo não encontrado no diretório especificado." if "file_path" in error['type'] else error['msg']
-                console.print(f"  • [cyan]{campo}[/cyan]: {msg}")
-            
-            console.print("\n[bold red]Interrompendo Script.[/bold red]")
-            raise RuntimeError("Código Interrompido")
+                failures.append((error['loc'][0], msg))
+            self._abort(failures)
             
         except Exception as e:
-            console.print(f"[bold red]ERRO INESPERADO AO LER YAML:[/bold red] {e}")
+            _console().print("[bold red]ERRO INESPERADO AO LER YAML:[/bold red] {}", e)
             raise RuntimeError("Erro Inesperado")
 
-    @property
+        if validate:
+            self._validate_paths()
+        else:
+            _console().print("[bold green]:white_check_mark: Configurações carregadas com sucesso![/bold green]")
+
+    def _validate_paths(self):
+        failures = self._check_paths()
+        if failures:
+            self._abort(failures)
+        self._validated = True
+        _console().print("[bold green]:white_check_mark: Configurações e arquivos validados com sucesso![/bold green]")
+
+    def _check_paths(self):
+        """
+        Confere a existência de todos os caminhos configurados em paralelo.
+        Os stats liberam o GIL, então caminhos em unidades de rede lentas não se somam.
+        Retorna a lista de (campo, mensagem) dos caminhos ausentes.
+        """
+        fields = list(PathConfig.model_fields)
+
+        def exists(field):
+            path = getattr(self._paths, field)
+            return path.is_dir() if field == 'output_path' else path.is_file()
+
+        with ThreadPoolExecutor(max_workers=len(fields)) as executor:
+            found = list(executor.map(exists, fields))
+
+        return [
+            (field, "Diretório não encontrado." if field == 'output_path' else "Arquivo não encontrado no diretório especificado.")
+            for field, ok in zip(fields, found) if not ok
+        ]
+
+    @staticmethod
+    def _abort(failures):
+        _console().print("\n[bold yellow]:warning: Falha na integridade dos dados/caminhos:[/bold yellow]")
+        for campo, msg in failures:
+            _console().print("  • [cyan]{}[/cyan]: {}", campo, msg)
+        
+        _console().print("\n[bold red]Interrompendo Script.[/bold red]")
+        raise RuntimeError("Código Interrompido")
+
+    @staticmethod
+    def _require(path: Path, is_dir=False) -> Path:
+        """Confere uma única vez se o caminho existe e retorna sua versão resolvida."""
+        exists = path.is_dir() if is_dir else path.is_file()
+        if not exists:
+            tipo = "Diretório" if is_dir else "Arquivo"
+            raise FileNotFoundError(f"{tipo} não encontrado: {path.absolute()}")
+        return path.resolve()
+
+    @cached_property
     def base_file(self) -> Path:
-        return self._paths.base.resolve()
+        return self._require(self._paths.base)
 
-    @property
+    @cached_property
     def cadastro_file(self) -> Path:
-        return self._paths.cadastro.resolve()
+        return self._require(self._paths.cadastro)
 
-    @property
+    @cached_property
     def gka_segmento_file(self) -> Path:
-        return self._paths.gka_por_segmento.resolve()
+        return self._require(self._paths.gka_por_segmento)
 
-    @property
+    @cached_property
     def lista_gka_file(self) -> Path:
-        return self._paths.lista_gka.resolve()
+        return self._require(self._paths.lista_gka)
 
-    @property
+    @cached_property
     def portfolio_file(self) -> Path:
-        return self._paths.portfolio.resolve()
+        return self._require(self._paths.portfolio)
     
     
-    @property
+    @cached_property
     def oem_file(self) -> Path:
-        return self._paths.oem.resolve()
+        return self._require(self._paths.oem)
     
     
-    @property
+    @cached_property
     def sellin_file(self) -> Path:
-        return self._paths.sellin.resolve()
+        return self._require(self._paths.sellin)
     
-    @property
+    @cached_property
     def output_path(self) -> Path:
-        return self._paths.output_path.resolve()
+        return self._require(self._paths.output_path, is_dir=True)
 
     @property
     def file_name(self):
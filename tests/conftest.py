@@ -0,0 +1,8 @@
+from pathlib import Path
+from settings import load_config
+import pytest
+
+@pytest.fixture(scope="session")
+def raw_config():
+    """Lê o config.yaml real uma única vez por sessão de testes."""
+    return load_config(Path(__file__).parent.parent / 'config.yaml')
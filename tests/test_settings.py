@@ -1,12 +1,14 @@
+import datetime
 from pathlib import Path
-from settings import Settings
+import yaml
+from settings import Settings, load_config, read_config_cache, write_config_cache, _Loader, _PlainConsole
 import pytest
 from pydantic import ValidationError
 
 @pytest.fixture
-def settings_instancia():
+def settings_instancia(raw_config):
     """Cria uma instância da classe Settings com o config.yaml real."""
-    return Settings()
+    return Settings.from_dict(raw_config)
 
 # --- TESTES DE EXISTÊNCIA E ESTRUTURA ---
 def test_config_file_exists():
@@ -43,8 +45,150 @@ def test_pydantic_validation_error(tmp_path):
     """Testa se o Pydantic bloqueia um YAML incompleto."""
     bad_config = tmp_path / "bad_config.yaml"
     bad_config.write_text("paths:\n  base: './base.xlsx'", encoding='utf-8')
+    Settings.reset_cache()
     
     with pytest.raises(RuntimeError) as excinfo:
         Settings(config_file=str(bad_config))
     
-    assert "Código Interrompido" in str(excinfo.value)
\ No newline at end of file
+    assert "Código Interrompido" in str(excinfo.value)
+
+def test_empty_path_value_is_rejected(tmp_path):
+    """Um caminho vazio no YAML (None) é barrado pelo Pydantic em vez de quebrar no Path()."""
+    campos = ['cadastro', 'gka_por_segmento', 'lista_gka', 'portfolio', 'oem', 'sellin', 'output_path']
+    config = tmp_path / "config.yaml"
+    config.write_text("paths:\n  base:\n" + "\n".join(f"  {c}: '{tmp_path}'" for c in campos), encoding='utf-8')
+    Settings.reset_cache()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        Settings(config_file=str(config))
+    assert "Código Interrompido" in str(excinfo.value)
+    Settings.reset_cache()
+
+# --- TESTES DE SINGLETON ---
+@pytest.fixture
+def valid_config(tmp_path):
+    """Cria um config.yaml temporário cujos caminhos existem no disco."""
+    campos = ['base', 'cadastro', 'gka_por_segmento', 'lista_gka', 'portfolio', 'oem', 'sellin']
+    linhas = ["paths:"]
+    for campo in campos:
+        arquivo = tmp_path / f"{campo}.xlsx"
+        arquivo.touch()
+        linhas.append(f"  {campo}: '{arquivo}'")
+    linhas.append(f"  output_path: '{tmp_path}'")
+
+    config = tmp_path / "config.yaml"
+    config.write_text("\n".join(linhas), encoding='utf-8')
+    Settings.reset_cache()
+    yield config
+    Settings.reset_cache()
+
+def test_settings_is_cached_per_config_file(valid_config):
+    """Instâncias com o mesmo config_file são reaproveitadas até reset_cache()."""
+    first = Settings(config_file=str(valid_config))
+    assert Settings(config_file=str(valid_config)) is first
+
+    Settings.reset_cache()
+    assert Settings(config_file=str(valid_config)) is not first
+
+def test_paths_are_checked_on_first_access(tmp_path):
+    """Sem validate=True, arquivos ausentes só são acusados ao acessar a property."""
+    config = tmp_path / "config.yaml"
+    campos = ['base', 'cadastro', 'gka_por_segmento', 'lista_gka', 'portfolio', 'oem', 'sellin', 'output_path']
+    config.write_text("paths:\n" + "\n".join(f"  {c}: '{tmp_path / 'nada'}'" for c in campos), encoding='utf-8')
+    Settings.reset_cache()
+
+    settings = Settings(config_file=str(config))
+    with pytest.raises(FileNotFoundError, match="Arquivo não encontrado"):
+        settings.base_file
+    with pytest.raises(FileNotFoundError, match="Diretório não encontrado"):
+        settings.output_path
+    Settings.reset_cache()
+
+def test_validate_checks_every_path(valid_config):
+    """Com validate=True todos os caminhos são conferidos em paralelo já na carga."""
+    settings = Settings(config_file=str(valid_config), validate=True)
+    assert settings.base_file.is_file()
+    assert settings.output_path.is_dir()
+
+def test_validate_reports_every_missing_path(valid_config, capsys):
+    """Com validate=True, todos os caminhos ausentes são reportados juntos."""
+    (valid_config.parent / "oem.xlsx").unlink()
+    (valid_config.parent / "sellin.xlsx").unlink()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        Settings(config_file=str(valid_config), validate=True)
+
+    assert "Código Interrompido" in str(excinfo.value)
+    saida = capsys.readouterr().out
+    assert "oem" in saida and "sellin" in saida
+
+def test_validate_on_cached_instance_checks_paths(valid_config):
+    """validate=True confere os caminhos mesmo quando a instância já estava em cache."""
+    settings = Settings(config_file=str(valid_config))
+    (valid_config.parent / "oem.xlsx").unlink()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        Settings(config_file=str(valid_config), validate=True)
+    assert "Código Interrompido" in str(excinfo.value)
+    assert Settings(config_file=str(valid_config)) is settings
+
+def test_path_properties_are_cached(valid_config):
+    """O caminho é resolvido uma única vez por instância."""
+    settings = Settings(config_file=str(valid_config))
+    first = settings.base_file
+    assert 'base_file' in vars(settings)
+    assert settings.base_file is first
+
+def test_from_dict_bypasses_instance_cache(valid_config):
+    """from_dict monta uma instância nova a partir do config já interpretado."""
+    raw_data = load_config(valid_config)
+    settings = Settings.from_dict(raw_data)
+
+    assert settings is not Settings.from_dict(raw_data)
+    assert settings.base_file.is_file()
+    assert str(valid_config) not in Settings._instances
+
+# --- TESTES DO CACHE DE CONFIGURAÇÃO ---
+def test_config_cache_roundtrip(tmp_path):
+    """O cache JSON é reaproveitado enquanto o YAML não muda e descartado quando muda."""
+    config = tmp_path / "config.yaml"
+    config.write_text("ui:\n  colors: ['red']", encoding='utf-8')
+    cache = config.with_suffix('.yaml.cache.json')
+
+    write_config_cache(cache, config.stat(), {'ui': {'colors': ['red']}})
+    assert read_config_cache(cache, config.stat()) == {'ui': {'colors': ['red']}}
+
+    config.write_text("ui:\n  colors: ['red', 'blue']", encoding='utf-8')
+    assert read_config_cache(cache, config.stat()) is None
+    assert list(tmp_path.glob("*.tmp")) == []
+
+def test_config_cache_ignores_json_that_is_not_an_object(tmp_path):
+    """Um cache com JSON válido mas sem a estrutura esperada é tratado como ausente."""
+    config = tmp_path / "config.yaml"
+    config.write_text("x: 1", encoding='utf-8')
+    cache = config.with_suffix('.yaml.cache.json')
+
+    cache.write_text("[]", encoding='utf-8')
+    assert read_config_cache(cache, config.stat()) is None
+
+def test_config_cache_skips_data_json_cannot_roundtrip(tmp_path):
+    """Datas e chaves não textuais não são cacheadas, e a escrita não falha."""
+    config = tmp_path / "config.yaml"
+    config.write_text("x: 1", encoding='utf-8')
+    cache = config.with_suffix('.yaml.cache.json')
+
+    write_config_cache(cache, config.stat(), {'ui': {'colors': {1: 'red'}}})
+    write_config_cache(cache, config.stat(), {'data': datetime.date(2025, 11, 1)})
+    assert not cache.exists()
+
+# --- TESTES DO CONSTRUTOR !join ---
+def test_join_constructor_concatenates_scalars():
+    """O !join concatena strings e converte escalares não textuais."""
+    data = yaml.load("a: &p '/dir'\nb: !join [*p, '/arq_', 11, '.xlsx']", Loader=_Loader)
+    assert data['b'] == '/dir/arq_11.xlsx'
+
+# --- TESTES DO CONSOLE ---
+def test_plain_console_keeps_interpolated_values(capsys):
+    """Sem terminal, só as marcações do template são removidas; os valores saem literais."""
+    _PlainConsole().print("[bold red]ERRO:[/bold red] {}", "/dados/[backup old]/:draft:/config.yaml")
+    assert capsys.readouterr().out == "ERRO: /dados/[backup old]/:draft:/config.yaml\n"
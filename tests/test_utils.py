@@ -1,14 +1,57 @@
+import os
 import pytest
 import pandas as pd
 from pathlib import Path
 from unittest.mock import patch
 import utils
 
+@pytest.fixture(autouse=True)
+def cache_isolado(tmp_path, monkeypatch):
+    """Direciona o cache de leituras de Excel para um diretório temporário em todos os testes."""
+    monkeypatch.setattr(utils, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(utils, "_SAFE_CACHE_DIRS", {})
+    monkeypatch.setattr(utils, "_UNCACHEABLE", set())
+
+# --- TESTES DE ANO-SAFRA ---
+def test_current_ano_safra_all_months():
+    """Confere a regra do Ano-Safra para todos os meses e a validação do parâmetro."""
+    esperado = ["10", "11", "12", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
+    assert [utils.current_ano_safra(m) for m in range(1, 13)] == esperado
+    with pytest.raises(ValueError):
+        utils.current_ano_safra(13)
+
 # --- TESTES DE LEITURA (MOCKING) ---
+def test_validate_file(tmp_path):
+    """Aceita arquivos existentes e recusa caminhos ausentes ou diretórios."""
+    arquivo = tmp_path / "dados.xlsx"
+    arquivo.touch()
+
+    assert utils.validate_file(arquivo) is True
+    with pytest.raises(FileNotFoundError):
+        utils.validate_file(tmp_path / "fantasma.xlsx")
+    with pytest.raises(FileNotFoundError):
+        utils.validate_file(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        utils.validate_file(arquivo / "dentro_de_arquivo.xlsx")
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() == 0, reason="Requer usuário POSIX sem privilégios.")
+def test_unreadable_file_is_not_served_from_cache(tmp_path):
+    """Um arquivo sem permissão de leitura é recusado mesmo com cache válido."""
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"col1": [1]}).to_excel(arquivo, index=False)
+    utils.read_safe_excel(arquivo)
+
+    arquivo.chmod(0)
+    try:
+        with pytest.raises(PermissionError):
+            utils.read_safe_excel(arquivo)
+    finally:
+        arquivo.chmod(0o600)
+
 def test_read_safe_excel_success():
     """Testa se a leitura retorna o DF quando o arquivo existe."""
     fake_path = Path("fake.xlsx")
-    with patch("utils.validate_file", return_value=True), \
+    with patch("utils._stat_regular_file", return_value=os.stat(__file__)), \
          patch("utils.pd.read_excel", return_value=pd.DataFrame({"col1": [1]})) as mock_read:
         
         df = utils.read_safe_excel(fake_path)
@@ -19,7 +62,7 @@ def test_read_safe_excel_success():
 
 def test_read_safe_excel_unsupported_engine():
     """Testa o comportamento quando a extensão não é catalogada."""
-    with patch("utils.validate_file", return_value=True), \
+    with patch("utils._stat_regular_file", return_value=os.stat(__file__)), \
          patch("utils.pd.read_excel") as mock_read:
         
         utils.read_safe_excel("arquivo.xyz")
@@ -29,7 +72,7 @@ def test_read_safe_excel_general_exception():
     """
     Testa se a função re-lança a exceção após emitir o aviso.
     """
-    with patch("utils.validate_file", return_value=True), \
+    with patch("utils._stat_regular_file", return_value=os.stat(__file__)), \
          patch("pandas.read_excel", side_effect=Exception("boom")):
         
         with pytest.raises(Exception) as excinfo:
@@ -37,6 +80,80 @@ def test_read_safe_excel_general_exception():
         
         assert "boom" in str(excinfo.value)
 
+def test_read_safe_excel_uses_parquet_cache(tmp_path):
+    """A segunda leitura do mesmo arquivo vem do cache, sem chamar o read_excel."""
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"col1": [1, 2]}).to_excel(arquivo, index=False)
+
+    df = utils.read_safe_excel(arquivo)
+    with patch("utils.pd.read_excel", side_effect=AssertionError("não deveria reler")):
+        df_cache = utils.read_safe_excel(arquivo)
+    pd.testing.assert_frame_equal(df, df_cache)
+
+    utils.read_safe_excel.clear_cache()
+    assert not (tmp_path / "cache").exists()
+
+def test_read_safe_excel_recovers_from_corrupted_cache(tmp_path):
+    """Um cache corrompido é descartado e a planilha é lida novamente."""
+    cache_dir = tmp_path / "cache"
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"col1": [1, 2]}).to_excel(arquivo, index=False)
+
+    df = utils.read_safe_excel(arquivo)
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    (cache_file,) = cache_dir.glob("*.parquet")
+    cache_file.write_bytes(cache_file.read_bytes()[:10])
+
+    pd.testing.assert_frame_equal(utils.read_safe_excel(arquivo), df)
+    pd.testing.assert_frame_equal(pd.read_parquet(cache_file), df)
+
+def test_read_safe_excel_does_not_cache_lossy_frames(tmp_path):
+    """Inteiros em coluna object não são cacheados, para não voltarem como float64."""
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"Cod": [1001, None, 1003]}).to_excel(arquivo, index=False)
+
+    primeira = utils.read_safe_excel(arquivo, dtype=object)
+    segunda = utils.read_safe_excel(arquivo, dtype=object)
+
+    assert not list((tmp_path / "cache").glob("*.parquet"))
+    pd.testing.assert_frame_equal(primeira, segunda)
+    assert segunda["Cod"].iloc[0] == 1001 and segunda["Cod"].dtype == object
+
+def test_excel_cache_keeps_only_latest_version(tmp_path):
+    """Gravar uma nova versão da planilha apaga o cache da versão anterior."""
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"col1": [1]}).to_excel(arquivo, index=False)
+    utils.read_safe_excel(arquivo)
+    (antigo,) = (tmp_path / "cache").glob("*.parquet")
+
+    pd.DataFrame({"col1": [1, 2]}).to_excel(arquivo, index=False)
+    os.utime(arquivo, ns=(1, 1))
+    assert len(utils.read_safe_excel(arquivo)) == 2
+
+    (atual,) = (tmp_path / "cache").glob("*.parquet")
+    assert atual != antigo
+
+def test_excel_cache_remembers_unstorable_frames(tmp_path):
+    """Uma planilha que o parquet não comporta só tenta ser serializada uma vez."""
+    arquivo = tmp_path / "dados.xlsx"
+    pd.DataFrame({"Misto": ["a", 1]}).to_excel(arquivo, index=False)
+    df_misto = pd.DataFrame({"Misto": pd.Series(["a", 1], dtype=object)})
+
+    with patch("utils.pd.read_excel", return_value=df_misto), \
+         patch.object(pd.DataFrame, "to_parquet", side_effect=ValueError("tipos mistos")) as mock_write:
+        utils.read_safe_excel(arquivo, dtype=str)
+        utils.read_safe_excel(arquivo, dtype=str)
+    assert mock_write.call_count == 0
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="Checagem de dono só existe em POSIX.")
+def test_excel_cache_ignores_dir_owned_by_other_user(tmp_path, monkeypatch):
+    """Um CACHE_DIR de outro usuário nunca é usado."""
+    monkeypatch.setattr(utils.os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+    arquivo = tmp_path / "dados.xlsx"
+    arquivo.touch()
+
+    assert utils._excel_cache_file(arquivo, arquivo.stat(), {}) is None
+
 def test_invalid_config_raises_runtime_error():
     """Garante que o erro customizado de configuração é lançado."""
     with pytest.raises(RuntimeError) as excinfo:
@@ -62,6 +179,17 @@ def test_remove_lines_interval(df_exemplo):
     assert len(df_result) == 3
     assert df_result.iloc[0]["A"] == 3
 
+def test_remove_lines_individual_and_range(df_exemplo):
+    """Testa a remoção de linhas avulsas e de uma faixa [início, fim)."""
+    assert list(df_exemplo.pipe(utils.remove_lines(0, 3))["A"]) == [2, 3, 5]
+    assert list(df_exemplo.pipe(utils.remove_lines(1, 3, mode='interval'))["A"]) == [1, 4, 5]
+
+def test_remove_columns_modes(df_exemplo):
+    """Testa a remoção de colunas por posição, individual e em intervalo."""
+    assert list(df_exemplo.pipe(utils.remove_columns(1)).columns) == ["A", "C"]
+    assert list(df_exemplo.pipe(utils.remove_columns(1, mode='interval')).columns) == ["B", "C"]
+    assert list(df_exemplo.pipe(utils.remove_columns(0, 2, mode='interval')).columns) == ["C"]
+
 def test_filter_columns_clean(df_exemplo):
     """Testa se o filtro remove espaços e seleciona corretamente (seu código usa .strip())."""
     transform = utils.filter_columns("B", "Varejo", "Atacado")
@@ -75,4 +203,50 @@ def test_rename_columns(df_exemplo):
     transform = utils.rename_columns("ID", "Segmento", "Valor")
     df_result = transform(df_exemplo)
     
-    assert list(df_result.columns) == ["ID", "Segmento", "Valor"]
\ No newline at end of file
+    assert list(df_result.columns) == ["ID", "Segmento", "Valor"]
+
+def test_filter_columns_after_to_arrow_strings(df_exemplo):
+    """Filtrar após pré-converter a coluna retorna o mesmo resultado."""
+    df_arrow = df_exemplo.pipe(utils.to_arrow_strings("B"))
+    assert df_arrow["B"].dtype == "string[pyarrow]"
+
+    df_result = df_arrow.pipe(utils.filter_columns("B", ["Varejo"]))
+    assert list(df_result["A"]) == [1, 3]
+
+    with patch.object(pd.Series, "astype", side_effect=AssertionError("não deveria converter")):
+        df_arrow.pipe(utils.filter_columns("B", ["Varejo"]))
+
+def test_extract_column_modes():
+    """Testa os modos 'in' e 'not-in' com colunas duplicadas e nomes sujos."""
+    df = pd.DataFrame([[" KAM1 ", "x", "y"], ["A CLASSIFICAR", "x", "y"], ["KAM2", "x", "y"]],
+                      columns=[" KAM ", "Outro", "Outro"])
+
+    assert df.pipe(utils.extract_column("KAM", "not-in", "A CLASSIFICAR")) == ["KAM1", "KAM2"]
+    assert df.pipe(utils.extract_column("KAM", "in", "KAM2")) == ["KAM2"]
+    with pytest.raises(KeyError):
+        df.pipe(utils.extract_column("Status"))
+
+def test_extract_column_numeric_headers():
+    """Cabeçalhos numéricos iguais em valor (1 e 1.0) não se confundem entre chamadas."""
+    pd.DataFrame({1: ["a"]}).pipe(utils.extract_column("1"))
+    assert pd.DataFrame({1.0: ["b"]}).pipe(utils.extract_column("1.0")) == ["b"]
+
+def test_clean_key_normalizes_without_touching_original():
+    """Testa se a chave é normalizada e o DataFrame original permanece intacto."""
+    df = pd.DataFrame({"IBM DODO": [" abc ", None, "none"], "Outra": [1, 2, 3]})
+    df_result = df.pipe(utils.clean_key("IBM DODO"))
+
+    assert df_result["IBM DODO"].iloc[0] == "ABC"
+    assert df_result["IBM DODO"].iloc[1:].isna().all()
+    assert df["IBM DODO"].iloc[0] == " abc "
+    with pytest.raises(KeyError):
+        df.pipe(utils.clean_key(["IBM DODO", "Inexistente"]))
+
+def test_filter_clean_matches_clean_key_then_filter(df_exemplo):
+    """filter_clean deve produzir o mesmo resultado de clean_key + filter_columns."""
+    esperado = df_exemplo.pipe(utils.clean_key("B")).pipe(utils.filter_columns("B", "VAREJO", "ATACADO"))
+    resultado = df_exemplo.pipe(utils.filter_clean("B", ["VAREJO", "ATACADO"]))
+
+    pd.testing.assert_frame_equal(resultado, esperado)
+    with pytest.raises(KeyError):
+        df_exemplo.pipe(utils.filter_clean("Z", "VAREJO"))
@@ -1,10 +1,44 @@
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import os
+import stat
+import hashlib
+import shutil
+import tempfile
 from pathlib import Path
 import warnings
+from types import MappingProxyType
 from typing import Callable
 
+def _user_cache_dir() -> Path:
+    """Diretório de cache exclusivo do usuário atual (LOCALAPPDATA no Windows, XDG_CACHE_HOME nos demais)."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'gka' / 'excel'
+
+CACHE_DIR = _user_cache_dir()
+# Entra na chave do cache: resultados de outro leitor/versão do pandas não são reaproveitados.
+_EXCEL_CACHE_VERSION = f"read_excel-1|pandas-{pd.__version__}"
+# Estado do cache no processo: diretórios já checados e leituras que o parquet não comporta.
+_SAFE_CACHE_DIRS: dict[Path, bool] = {}
+_UNCACHEABLE: set[str] = set()
+_EXCEL_ENGINES: MappingProxyType[str, str] = MappingProxyType({
+    '.xlsx': 'openpyxl',
+    '.xlsm': 'openpyxl',
+    '.xls':  'xlrd',
+    '.xlsb': 'pyxlsb'
+})
+# Textos que clean_key trata como nulos após strip/upper.
+_NULL_TOKENS = pa.array(['NAN', 'NONE'])
+_NULL_STRING = pa.scalar(None, type=pa.string())
+# Ano-Safra por mês civil (índice 0 não utilizado): abril abre a safra.
+_ANO_SAFRA = ('', '10', '11', '12', '1', '2', '3', '4', '5', '6', '7', '8', '9')
+
 def current_ano_safra(month=None) -> str:
     """
     Verifica e retorna o Ano-Safra atual.
@@ -36,12 +70,23 @@ def current_ano_safra(month=None) -> str:
     if not 1<= month <= 12:
         raise ValueError("O parâmetro 'month' deve estar entre 1 e 12.")
 
-    if month == 4:
-        return str(1)
-    elif month >= 5:
-        return str(month - 3)
-    else:
-        return str(month + 9)
+    return _ANO_SAFRA[month]
+
+def _stat_regular_file(path) -> os.stat_result:
+    """
+    Faz um único os.stat no caminho e confere se é um arquivo regular.
+    Retorna o resultado do stat para que quem chama não precise repeti-lo.
+    """
+    try:
+        st = os.stat(path)
+    except PermissionError:
+        raise PermissionError(f"Sem permissão de leitura no arquivo: {path}") from None
+    except OSError:
+        raise FileNotFoundError(f"Arquivo não encontrado: {Path(path).absolute()}") from None
+
+    if not stat.S_ISREG(st.st_mode):
+        raise FileNotFoundError(f"O caminho não é um arquivo: {Path(path).absolute()}")
+    return st
 
 def validate_file(path) -> True:
     """
@@ -53,26 +98,123 @@ def validate_file(path) -> True:
         path (str or Path): O caminho do arquivo.
 
     Returns:
-        True: True se o arquivo existir e for legível.
+        True: True se o arquivo existir e for um arquivo regular.
 
     Raises:
-        FileNotFoundError: Se o arquivo não for encontrado, retorna FileNotFoundError.
-        PermissionError: Caso não haja permissão para abrir o arquivo, retorna PermissionError.
+        FileNotFoundError: Se o arquivo não for encontrado (ou não for um arquivo), retorna FileNotFoundError.
+        PermissionError: Caso não haja permissão para acessar o caminho, retorna PermissionError.
+            A falta de permissão de leitura do próprio arquivo é acusada na abertura.
         
     Example:
         >>> validate_file("data/input.csv")
         True
     """
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"Arquivo não encontrado: {p.absolute()}")
-    if not os.access(p, os.R_OK):
-        raise PermissionError(f"Sem permissão de leitura no arquivo: {p}")
+    _stat_regular_file(path)
     return True
 
+def _cache_dir_is_safe() -> bool:
+    """
+    Cria o CACHE_DIR com permissão 0o700 e confere se ele pertence ao usuário atual.
+    Um diretório de outro usuário (ou que não seja um diretório) nunca é usado.
+    A checagem é feita uma vez por processo para cada CACHE_DIR.
+    """
+    if CACHE_DIR in _SAFE_CACHE_DIRS:
+        return _SAFE_CACHE_DIRS[CACHE_DIR]
+
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+        safe = stat.S_ISDIR(st.st_mode) and (os.name == 'nt' or st.st_uid == os.getuid())
+        if safe and os.name != 'nt' and st.st_mode & 0o077:
+            os.chmod(CACHE_DIR, 0o700)
+    except OSError:
+        safe = False
+    _SAFE_CACHE_DIRS[CACHE_DIR] = safe
+    return safe
+
+def _excel_cache_file(p: Path, st: os.stat_result, kwargs: dict) -> Path | None:
+    """
+    Monta o caminho do cache parquet de uma leitura de Excel.
+    O nome tem duas partes: o prefixo identifica a leitura (caminho + argumentos) e o
+    sufixo a versão do arquivo (mtime, tamanho e versão do leitor). Qualquer alteração
+    no arquivo gera um novo sufixo, e as versões antigas do mesmo prefixo são apagadas
+    ao gravar.
+    Retorna None quando o diretório de cache não pode ser usado ou a leitura já se
+    mostrou impossível de cachear.
+    """
+    if not _cache_dir_is_safe():
+        return None
+    reading = f"{os.path.abspath(p)}|{sorted(kwargs.items())}"
+    version = f"{_EXCEL_CACHE_VERSION}|{st.st_mtime_ns}|{st.st_size}"
+    name = f"{_cache_hash(reading)}-{_cache_hash(version)}.parquet"
+    if name in _UNCACHEABLE:
+        return None
+    return CACHE_DIR / name
+
+def _cache_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def _read_excel_cache(cache_file: Path) -> pd.DataFrame | None:
+    """Lê o cache; um arquivo corrompido é removido e a planilha volta a ser lida."""
+    try:
+        return pd.read_parquet(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        cache_file.unlink(missing_ok=True)
+        return None
+
+def _parquet_roundtrip_is_lossless(df: pd.DataFrame) -> bool:
+    """
+    Indica se o DataFrame volta do parquet com os mesmos valores.
+    Colunas object só passam quando contêm apenas textos: números em colunas object
+    (ex: dtype=object ou converters=) voltariam como float64, mudando '1001' para '1001.0'.
+    """
+    return all(
+        pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+        for col, dtype in df.dtypes.items() if dtype == object
+    )
+
+def _write_excel_cache(df: pd.DataFrame, cache_file: Path) -> None:
+    """
+    Grava o DataFrame no cache via arquivo temporário + os.replace, para que uma escrita
+    interrompida nunca deixe um parquet incompleto no nome final, e apaga as versões
+    anteriores da mesma leitura. Leituras que falham ao gravar (ex: colunas com tipos
+    mistos) são lembradas e não são serializadas de novo neste processo.
+    """
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    except OSError:
+        # O diretório pode ter sido removido: volta a checá-lo na próxima leitura.
+        _SAFE_CACHE_DIRS.pop(CACHE_DIR, None)
+        return
+    os.close(fd)
+
+    try:
+        df.to_parquet(tmp_name)
+        os.replace(tmp_name, cache_file)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        _UNCACHEABLE.add(cache_file.name)
+        return
+
+    prefix = cache_file.name.split('-')[0]
+    for old in CACHE_DIR.glob(f"{prefix}-*.parquet"):
+        if old != cache_file:
+            old.unlink(missing_ok=True)
+
+def clear_excel_cache() -> None:
+    """Remove todos os arquivos do cache de leituras de Excel."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    _SAFE_CACHE_DIRS.pop(CACHE_DIR, None)
+    _UNCACHEABLE.clear()
+
 def read_safe_excel(path, **kwargs) -> pd.DataFrame:
     """
     Tenta ler um arquivo Excel tratando extensões e motores automaticamente.
+    O resultado é guardado em cache parquet (em CACHE_DIR, exclusivo do usuário) e reaproveitado enquanto
+    o arquivo e os argumentos de leitura não mudarem. Use read_safe_excel.clear_cache()
+    para descartá-lo.
     Args:
         path (str or Path): O caminho do arquivo.
         *kwargs: Argumentos adicionais repassados para pandas.read_excel.
@@ -84,39 +226,52 @@ def read_safe_excel(path, **kwargs) -> pd.DataFrame:
     Example:
         >>> read_safe_excel("data/input.xlsx", sheet_name="Sheet1")
     """
-    validate_file(path)
+    st = _stat_regular_file(path)
 
     p = Path(path)
     ext = p.suffix.lower()
 
-    engines = {
-        '.xlsx': 'openpyxl',
-        '.xlsm': 'openpyxl',
-        '.xls':  'xlrd',
-        '.xlsb': 'pyxlsb'
-    }
-
     try:
-        if ext in engines and 'engine' not in kwargs:
-            kwargs['engine'] = engines[ext]
+        if ext in _EXCEL_ENGINES and 'engine' not in kwargs:
+            kwargs['engine'] = _EXCEL_ENGINES[ext]
         else:
             if 'engine' not in kwargs:
                 warnings.warn(f"ℹExtensão {ext} não catalogada. Tentando motor padrão do Pandas.", UserWarning)
-        return pd.read_excel(p, **kwargs)
+
+        cache_file = _excel_cache_file(p, st, kwargs)
+        if cache_file is not None:
+            cached = _read_excel_cache(cache_file)
+            if cached is not None:
+                # Sem o read_excel ninguém abre a planilha: confere aqui se ela ainda é legível.
+                try:
+                    open(p, 'rb').close()
+                except PermissionError:
+                    raise PermissionError(f"Sem permissão de leitura no arquivo: {p}") from None
+                return cached
+
+        df = pd.read_excel(p, **kwargs)
+        if cache_file is not None and isinstance(df, pd.DataFrame):
+            if _parquet_roundtrip_is_lossless(df):
+                _write_excel_cache(df, cache_file)
+            else:
+                _UNCACHEABLE.add(cache_file.name)
+        return df
 
     except ImportError as e:
-        needed_pkg = engines.get(ext, "o motor adequado")
+        needed_pkg = _EXCEL_ENGINES.get(ext, "o motor adequado")
         warnings.warn(f"Erro: Falta instalar o pacote para arquivos {ext}. Tente: pip install {needed_pkg}", UserWarning)
         raise
     except Exception as e:
         warnings.warn(f"Erro ao ler {p.name}: {e}", UserWarning)
         raise
 
+read_safe_excel.clear_cache = clear_excel_cache
+
 def remove_lines(*args, mode='individual'):
     """
     Remove linhas de um DataFrame.
     Args:
-        *args (int): Recebe quais linhas devem ser removidas.
+        *args (int): Recebe as posições das linhas que devem ser removidas.
         mode: Diz se as linhas devem ser removidas de forma individual ou em intervalo.
             'individual' (padrão): Removerá exatamente as linhas informadas.
             'interval': Removerá uma faixa de linhas baseado nas informadas.
@@ -132,18 +287,21 @@ def remove_lines(*args, mode='individual'):
     """
     def transform_df(df):
         if mode == 'interval' and len(args) == 1:
-            return df.drop(list(range(0, args[0])))
-        elif mode == 'interval' and len(args) == 2:
-            return df.drop(list(range(args[0],args[1])))
+            return df.iloc[args[0]:]
+
+        mask = np.ones(len(df), dtype=bool)
+        if mode == 'interval' and len(args) == 2:
+            mask[args[0]:args[1]] = False
         else:
-            return df.drop(list(args))
+            mask[list(args)] = False
+        return df.iloc[mask]
     return transform_df
 
 def remove_columns(*args, mode='individual'):
     """
     Remove colunas de um DataFrame.
     Args:
-        *args (int): Recebe quais colunas devem ser removidas.
+        *args (int): Recebe as posições das colunas que devem ser removidas.
         mode: Diz se as colunas devem ser removidas de forma individual ou em intervalo.
             'individual' (padrão): Removerá exatamente as colunas informadas.
             'interval': Removerá uma faixa de colunas baseado nas informadas.
@@ -159,11 +317,14 @@ def remove_columns(*args, mode='individual'):
     """
     def transform_df(df):
         if mode == 'interval' and len(args) == 1:
-            return df.drop(df.columns[0:args[0]], axis=1)
-        elif mode == 'interval' and len(args) == 2:
-            return df.drop(df.columns[args[0]:args[1]], axis=1)
+            return df.iloc[:, args[0]:]
+
+        mask = np.ones(df.shape[1], dtype=bool)
+        if mode == 'interval' and len(args) == 2:
+            mask[args[0]:args[1]] = False
         else:
-            return df.drop(df.columns[list(args)], axis=1)
+            mask[list(args)] = False
+        return df.iloc[:, mask]
     return transform_df
 
 def rename_columns(*args):
@@ -172,11 +333,42 @@ def rename_columns(*args):
         return df.set_axis(list(args), axis=1)
     return transform_df
 
-def filter_columns(column, *args):
-    """Filtra colunas de um DataFrame."""
+def to_arrow_strings(*cols):
+    """
+    Converte colunas para o tipo string[pyarrow].
+    Útil antes de aplicar vários filter_columns sobre o mesmo DataFrame,
+    pois a conversão é feita uma única vez.
+
+    Example:
+        >>> df = df.pipe(to_arrow_strings("KAM", "Segmento"))
+    """
+    def transform_df(df):
+        return df.astype({col: 'string[pyarrow]' for col in cols})
+    return transform_df
+
+def _value_set(args: tuple) -> frozenset:
+    """Aceita os valores de filtro avulsos ou como uma única coleção (list, Series ou set)."""
+    if len(args) == 1 and isinstance(args[0], (list, pd.Series, set, frozenset)):
+        return frozenset(args[0])
+    return frozenset(args)
+
+def filter_columns(column, *args, copy=False):
+    """
+    Filtra colunas de um DataFrame.
+    A coluna é convertida para string[pyarrow] (caso ainda não seja), de modo que
+    strip e isin rodem nos kernels vetorizados do Arrow. Para vários filtros sobre
+    o mesmo DataFrame, converta antes com to_arrow_strings.
+    Por padrão retorna o recorte sem cópia; use copy=True para obter um DataFrame independente.
+    """
+    values = _value_set(args)
+
     def transform_df(df):
-        values = args[0] if len(args) == 1 and isinstance(args[0], (list, pd.Series, set)) else args
-        return df[df[column].str.strip().isin(values)].copy()
+        col = df[column]
+        # O dtype str padrão do pandas 3 já é Arrow; só converte o que ainda não for.
+        if not isinstance(col.array, pd.arrays.ArrowStringArray):
+            col = col.astype('string[pyarrow]')
+        mask = col.str.strip().isin(values)
+        return df.loc[mask].copy() if copy else df.loc[mask]
     return transform_df
 
 def extract_column(column, mode='not-in', *args):
@@ -204,30 +396,46 @@ def extract_column(column, mode='not-in', *args):
         >>> kams = df.pipe(extract_column("KAM", "not-in", "A CLASSIFICAR"))
         >>> skus = df.pipe(extract_column("Status", "in", "ATIVO", "PENDENTE"))
     """
+    ref = frozenset(args)
+
     def transform_column(df):
-        df = df.loc[:, ~df.columns.duplicated()].copy()
-        df.columns = [str(c).strip() for c in df.columns]
+        # Nome limpo (str + strip) -> posição; em colunas duplicadas prevalece a primeira.
+        positions = {}
+        for i, c in enumerate(df.columns):
+            positions.setdefault(str(c).strip(), i)
 
-        if column not in df.columns:
-            raise KeyError(f"Coluna '{column}' não encontrada. Colunas disponíveis: {list(df.columns)}")
+        if column not in positions:
+            raise KeyError(f"Coluna '{column}' não encontrada. Colunas disponíveis: {list(positions)}")
 
-        unique_values = (
-            df.loc[:, column]
+        unique_values = pd.Series(
+            df.iloc[:, positions[column]]
             .dropna()
             .astype(str)
             .str.strip()
             .unique()
         )
+        mask = unique_values.isin(ref)
         if mode == 'not-in':
-            column_list = [t for t in unique_values if t not in args]
+            column_list = unique_values[~mask].tolist()
         elif mode == "in":
-            column_list = [t for t in unique_values if t in args]         
+            column_list = unique_values[mask].tolist()
         else:
             raise ValueError("O valor do segundo parâmetro deve ser 'in' ou 'not-in'.")   
         
         return column_list
     return transform_column
 
+def _normalize_key(series: pd.Series) -> pd.api.extensions.ExtensionArray:
+    """
+    Aplica strip, upper e a troca de 'NAN'/'NONE' por nulo sobre um único array Arrow,
+    usando os kernels do pyarrow.compute em vez de objetos Python. Retorna string[pyarrow].
+    """
+    arr = pa.array(series.astype(str))
+    arr = pc.utf8_upper(pc.utf8_trim_whitespace(arr))
+    mask = pc.is_in(arr, value_set=_NULL_TOKENS)
+    arr = pc.if_else(mask, _NULL_STRING, arr)
+    return pd.array(arr, dtype='string[pyarrow]')
+
 def clean_key(col: str | list) -> Callable[[pd.DataFrame], pd.DataFrame]:
     """
     Normaliza um DataFrame para que seja possível trabalhar com ele.
@@ -247,13 +455,40 @@ def clean_key(col: str | list) -> Callable[[pd.DataFrame], pd.DataFrame]:
     column_list = [col] if isinstance(col, str) else col
 
     def transform_df(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
         for col in column_list:
             if col not in df.columns:
                 raise KeyError(f"Coluna '{col}' não encontrada.")
 
-            df[col] = df[col].astype(str).str.strip().str.upper()
-            df[col] = df[col].replace('NAN', pd.NA).replace('NONE', pd.NA)
-            
-        return df
+        return df.assign(**{col: _normalize_key(df[col]) for col in column_list})
+    return transform_df
+
+def filter_clean(column, *args):
+    """
+    Normaliza a coluna-chave e filtra o DataFrame de uma só vez.
+    Equivale a aplicar clean_key(column) seguido de filter_columns(column, *args),
+    mas só cria o DataFrame final, já com a coluna normalizada nas linhas mantidas.
+
+    Args:
+        column (str): Nome da coluna a ser normalizada e filtrada.
+        *args: Valores aceitos (já normalizados, em letras maiúsculas),
+            avulsos ou como uma única lista/Series/set.
+
+    Returns:
+        pd.DataFrame: Retorna o DataFrame filtrado.
+
+    Raises:
+        KeyError: Se a coluna não for encontrada, retorna KeyError.
+
+    Example:
+        >>> df.pipe(filter_clean("Segmento", "VAREJO", "ATACADO"))
+    """
+    values = _value_set(args)
+
+    def transform_df(df: pd.DataFrame) -> pd.DataFrame:
+        if column not in df.columns:
+            raise KeyError(f"Coluna '{column}' não encontrada.")
+
+        key = _normalize_key(df[column])
+        mask = key.isin(values)
+        return df.loc[mask].assign(**{column: key[mask]})
     return transform_df
\ No newline at end of file